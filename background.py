@@ -4,23 +4,75 @@ Major performance improvements for fullscreen usage
 """
 
 import math
+import logging
+import numpy as np
 from kivy.uix.widget import Widget
 from kivy.uix.floatlayout import FloatLayout
-from kivy.graphics import Color, Rectangle, Mesh
+from kivy.graphics import Color, Rectangle, Mesh, RenderContext
 from kivy.graphics.texture import Texture
 from kivy.graphics.instructions import InstructionGroup
 from kivy.clock import Clock
 from kivy.core.window import Window
 from typing import List
 
+log = logging.getLogger("fin_alpha")
+
+
+def compute_wave_heights(sin_kx, cos_kx, offsets, amps, base_y, scratch, out):
+    """Write clipped heights of every wave into out, reusing caller-owned buffers
+    
+    Uses sin(kx + a) = sin(kx)cos(a) + cos(kx)sin(a): sin_kx and cos_kx are
+    (n_waves, n_samples) grids sampled once per resize, while offsets and amps
+    are (n_waves, 1) columns, so a frame costs one sin/cos per wave instead of
+    one per sample. out[i] = max(0, base_y + amps[i] * sin(kx[i] + offsets[i])).
+    """
+    np.multiply(sin_kx, np.cos(offsets), out=out)
+    np.multiply(cos_kx, np.sin(offsets), out=scratch)
+    np.add(out, scratch, out=out)
+    np.multiply(out, amps, out=out)
+    np.add(out, base_y, out=out)
+    np.maximum(out, 0, out=out)
+
+
+# Minimal shader pair that takes the fill color from each vertex, so all
+# waves can share one Mesh and one draw call
+VERTEX_COLOR_VS = '''
+$HEADER$
+
+attribute vec4 vColor;
+
+void main(void) {
+    frag_color = vColor * vec4(1.0, 1.0, 1.0, opacity);
+    tex_coord0 = vec2(0.0);
+    gl_Position = projection_mat * modelview_mat * vec4(vPosition.xy, 0.0, 1.0);
+}
+'''
+
+VERTEX_COLOR_FS = '''
+$HEADER$
+
+void main(void) {
+    gl_FragColor = frag_color;
+}
+'''
+
+WAVE_VERTEX_FORMAT = [(b'vPosition', 2, 'float'), (b'vColor', 4, 'float')]
+
 
 class OptimizedWaveWidget(Widget):
     """Highly optimized wave animation using mesh and reduced updates"""
     
     def __init__(self, **kwargs):
+        # Waves are drawn with custom shaders, so the widget owns its render context
+        self.canvas = RenderContext(
+            use_parent_projection=True,
+            use_parent_modelview=True,
+            use_parent_frag_modelview=True
+        )
         super().__init__(**kwargs)
         
         self.time = 0
+        self._last_drawn_time = 0
         self.speed = 0.015
         self.update_interval = 1/15.0  # Reduced to 15 FPS for better performance
         
@@ -31,14 +83,51 @@ class OptimizedWaveWidget(Widget):
             {'color': (0.3, 0.6, 0.85, 0.4), 'amp': 25, 'freq': 0.01, 'phase': 4}
         ]
         
+        # Struct-of-arrays copy of the wave parameters so one kernel call
+        # evaluates every wave at once; float32 is plenty for pixel output
+        self._amp = np.array([wave['amp'] for wave in self.waves], dtype=np.float32)[:, None]
+        self._freq = np.array([wave['freq'] for wave in self.waves], dtype=np.float32)[:, None]
+        self._phase = np.array([wave['phase'] for wave in self.waves], dtype=np.float32)[:, None]
+        self._offsets = np.empty_like(self._phase)
+        self._max_amp = float(self._amp.max())
+        
         # Pre-calculate segments based on window width once
         self.segments = 0
-        self.wave_instructions = []
         
-        self.bind(size=self._setup_waves, pos=self._setup_waves)
+        self.wave_mesh = None
+        self._create_instructions()
+        
+        # size and pos usually change together, coalesce them into one rebuild
+        self._redraw_pending = False
+        self.bind(size=self._schedule_redraw, pos=self._schedule_redraw)
         self._animation_event = None
+        
+        # Don't burn frames on a wave nobody can see
+        Window.bind(on_minimize=self._on_window_minimize, on_restore=self._on_window_restore)
+        self.bind(parent=self._on_visibility_change, opacity=self._on_visibility_change)
         self.start_animation()
     
+    def _create_instructions(self):
+        """Create a single triangle-strip Mesh for all waves, updated in place afterwards"""
+        self.canvas.shader.vs = VERTEX_COLOR_VS
+        self.canvas.shader.fs = VERTEX_COLOR_FS
+        if not self.canvas.shader.success:
+            raise RuntimeError("Wave vertex-color shader failed to compile")
+        
+        with self.canvas:
+            self.wave_mesh = Mesh(fmt=WAVE_VERTEX_FORMAT, mode='triangle_strip')
+    
+    def _schedule_redraw(self, *args):
+        """Debounce layout events so a resize rebuilds the waves once per frame"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            Clock.schedule_once(self._do_redraw, 0)
+    
+    def _do_redraw(self, dt):
+        """Rebuild the wave buffers after the debounce"""
+        self._redraw_pending = False
+        self._setup_waves()
+    
     def _setup_waves(self, *args):
         """Setup wave meshes - only called on resize"""
         if self.width <= 0 or self.height <= 0:
@@ -46,6 +135,44 @@ class OptimizedWaveWidget(Widget):
         
         # Adaptive segment count based on width (fewer segments = better performance)
         self.segments = min(max(int(self.width / 8), 30), 100)
+        if Window.width < 600:  # Small (mobile) screens can't show the extra detail
+            self.segments = min(self.segments, 64)
+        
+        # Column x offsets only change on resize, so sample them once here
+        self._segment_width = self.width / self.segments
+        self._xs = np.arange(self.segments + 1, dtype=np.float32) * self._segment_width
+        
+        # Every wave column contributes a (bottom, top) vertex pair of
+        # (x, y, r, g, b, a); x, baseline and colors only change on resize,
+        # frames just rewrite the tops
+        num_waves = len(self.waves)
+        self._mesh_verts = np.zeros((num_waves, self.segments + 1, 2, 6), dtype=np.float32)
+        self._mesh_verts[..., 0] = (self._xs + self.x)[None, :, None]
+        self._mesh_verts[..., 1] = self.y
+        self._mesh_verts[..., 2:] = np.array(
+            [wave['color'] for wave in self.waves], dtype=np.float32
+        )[:, None, None, :]
+        
+        # The x * freq phase of every sample is fixed until the next resize
+        kx = self._xs * self._freq
+        self._sin_kx = np.sin(kx)
+        self._cos_kx = np.cos(kx)
+        
+        # Scratch buffers for the per-frame wave kernel, one row per wave
+        self._scratch = np.empty_like(kx)
+        self._out_y = np.empty_like(kx)
+        
+        # Waves are stitched into one strip, back to front, by repeating the
+        # last vertex of a wave and the first of the next (degenerate triangles)
+        strip_len = (self.segments + 1) * 2
+        indices = []
+        for i in range(num_waves):
+            start = i * strip_len
+            if indices:
+                indices.extend((indices[-1], start))
+            indices.extend(range(start, start + strip_len))
+        self.wave_mesh.indices = indices
+        
         self._update_waves()
     
     def start_animation(self):
@@ -60,37 +187,164 @@ class OptimizedWaveWidget(Widget):
             self._animation_event.cancel()
             self._animation_event = None
     
+    def _is_visible(self):
+        """Whether the wave is attached and not faded out"""
+        return self.parent is not None and self.opacity > 0
+    
+    def _on_visibility_change(self, *args):
+        """Pause the animation while detached or transparent"""
+        if not self._is_visible():
+            self.stop_animation()
+        elif not self._animation_event:
+            self.start_animation()
+    
+    def _on_window_minimize(self, *args):
+        """Pause the animation while the window is minimized"""
+        self.stop_animation()
+    
+    def _on_window_restore(self, *args):
+        """Resume the animation when the window comes back"""
+        if self._is_visible():
+            self.start_animation()
+    
     def _animate(self, dt):
         """Update animation time and redraw"""
-        self.time += self.speed
+        if not self.get_root_window() or self.opacity == 0:
+            return
+        
+        # Time only enters as a phase offset, so wrap it to keep float32 phases precise
+        self.time = (self.time + self.speed) % (2 * math.pi)
+        
+        # A wave point moves at most amp * phase delta, so skip frames where
+        # every wave would shift by less than half a pixel
+        delta = abs(self.time - self._last_drawn_time)
+        delta = min(delta, 2 * math.pi - delta)
+        if self._max_amp * delta < 0.5:
+            return
+        
+        self._last_drawn_time = self.time
         self._update_waves()
     
     def _update_waves(self, *args):
-        """Draw all waves using optimized rectangle strips"""
+        """Update the wave mesh in place from a vectorized sample"""
         if self.width <= 0 or self.height <= 0 or self.segments == 0:
             return
         
-        self.canvas.clear()
+        base_y = self.height * 0.25
         
-        segment_width = self.width / self.segments
+        np.add(self._phase, self.time, out=self._offsets)
+        compute_wave_heights(
+            self._sin_kx, self._cos_kx, self._offsets, self._amp, base_y,
+            self._scratch, self._out_y
+        )
+        np.add(self._out_y, self.y, out=self._mesh_verts[:, :, 1, 1])
+        self.wave_mesh.vertices = self._mesh_verts.ravel().tolist()
+
+
+# Fragment shader evaluating every wave per pixel; {waves} is filled with one
+# compositing line per wave so the parameters are compile-time constants
+WAVE_FRAGMENT_SHADER = '''
+$HEADER$
+
+uniform float u_time;
+uniform vec2 u_size;
+
+vec4 over(vec4 dst, vec4 src, float coverage) {
+    float a = src.a * coverage;
+    return vec4(src.rgb * a + dst.rgb * (1.0 - a), a + dst.a * (1.0 - a));
+}
+
+void main(void) {
+    vec2 p = tex_coord0 * u_size;
+    float base_y = u_size.y * 0.25;
+    vec4 acc = vec4(0.0);
+{waves}
+    gl_FragColor = vec4(acc.rgb / max(acc.a, 0.0001), acc.a * frag_color.a);
+}
+'''
+
+WAVE_SHADER_LINE = (
+    "    acc = over(acc, vec4({r:.4f}, {g:.4f}, {b:.4f}, {a:.4f}), "
+    "step(p.y, base_y + {amp:.4f} * sin(p.x * {freq:.6f} + u_time + {phase:.4f})));"
+)
+
+
+class ShaderWaveWidget(OptimizedWaveWidget):
+    """Wave animation composited on the GPU in a single fragment shader
+    
+    The CPU only updates the u_time uniform each frame.
+    """
+    
+    def _create_instructions(self):
+        """Compile the wave shader and create the quad it is drawn on"""
+        wave_lines = "\n".join(
+            WAVE_SHADER_LINE.format(
+                r=wave['color'][0], g=wave['color'][1], b=wave['color'][2], a=wave['color'][3],
+                amp=float(wave['amp']), freq=float(wave['freq']), phase=float(wave['phase'])
+            )
+            for wave in self.waves
+        )
+        self.canvas.shader.fs = WAVE_FRAGMENT_SHADER.replace('{waves}', wave_lines)
+        if not self.canvas.shader.success:
+            raise RuntimeError("Wave shader failed to compile")
         
         with self.canvas:
-            for wave in self.waves:
-                Color(*wave['color'])
-                
-                # Draw wave using vertical strips (much faster than individual rectangles)
-                for i in range(self.segments):
-                    x = i * segment_width
-                    wave_y = math.sin(x * wave['freq'] + self.time + wave['phase']) * wave['amp']
-                    base_y = self.height * 0.25
-                    y = self.y + base_y + wave_y
-                    
-                    height = max(0, y - self.y)
-                    if height > 0:
-                        Rectangle(
-                            pos=(x + self.x, self.y),
-                            size=(segment_width + 1, height)
-                        )
+            Color(1, 1, 1, 1)
+            self.wave_rect = Rectangle(pos=self.pos, size=self.size)
+    
+    def _setup_waves(self, *args):
+        """Fit the shader quad to the widget - only called on resize"""
+        if self.width <= 0 or self.height <= 0:
+            return
+        
+        self.wave_rect.pos = self.pos
+        self.wave_rect.size = self.size
+        self.canvas['u_size'] = [float(self.width), float(self.height)]
+        self._update_waves()
+    
+    def _update_waves(self, *args):
+        """Advance the shader clock, the GPU redraws every wave"""
+        self.canvas['u_time'] = float(self.time)
+
+
+def gradient_rgba(gradient_colors, gradient_height: int) -> np.ndarray:
+    """Smoothstepped vertical gradient through gradient_colors as (height, 4) RGBA bytes"""
+    num_colors = len(gradient_colors)
+    colors = np.asarray(gradient_colors, dtype=np.float32)
+    
+    # Smoothstep over the full height, then smoothstep again inside each color segment
+    t = np.arange(gradient_height, dtype=np.float32) / (gradient_height - 1)
+    t = t * t * (3.0 - 2.0 * t)
+    
+    segment = t * (num_colors - 1)
+    segment_index = np.minimum(segment.astype(np.int32), num_colors - 2)
+    local_t = segment - segment_index.astype(np.float32)
+    local_t = local_t * local_t * (3.0 - 2.0 * local_t)
+    
+    color1 = colors[segment_index]
+    color2 = colors[segment_index + 1]
+    
+    # Write straight into one contiguous RGBA byte buffer, alpha prefilled
+    gradient_data = np.full((gradient_height, 4), 255, dtype=np.uint8)
+    gradient_data[:, :3] = (color1 + (color2 - color1) * local_t[:, None]) * 255
+    return gradient_data
+
+
+# Fixed texture height instead of scaling with the window; the GPU stretches it
+GRADIENT_HEIGHT = 512
+
+# Deep to light ocean blues, bottom to top
+OCEAN_GRADIENT_COLORS = np.array([
+    (0.01, 0.06, 0.20),
+    (0.03, 0.12, 0.30),
+    (0.06, 0.20, 0.42),
+    (0.12, 0.35, 0.60),
+    (0.20, 0.50, 0.75),
+    (0.30, 0.65, 0.85)
+], dtype=np.float32)
+
+# Texture bytes for the default gradient, computed once per process
+OCEAN_GRADIENT_RGBA = gradient_rgba(OCEAN_GRADIENT_COLORS, GRADIENT_HEIGHT)
 
 
 class OptimizedGradient(FloatLayout):
@@ -100,17 +354,15 @@ class OptimizedGradient(FloatLayout):
         super().__init__(**kwargs)
         
         # Simplified gradient colors
-        self.gradient_colors = [
-            (0.01, 0.06, 0.20),
-            (0.03, 0.12, 0.30),
-            (0.06, 0.20, 0.42),
-            (0.12, 0.35, 0.60),
-            (0.20, 0.50, 0.75),
-            (0.30, 0.65, 0.85)
-        ]
+        self.gradient_colors = OCEAN_GRADIENT_COLORS
         
+        # The texture depends only on gradient_colors, so build it and the
+        # rectangle showing it once; resizes just stretch the rectangle
         self.gradient_texture = None
-        self.gradient_instruction = None
+        self.gradient_texture = self._create_gradient_texture()
+        with self.canvas.before:
+            Color(1, 1, 1, 1)
+            self.gradient_instruction = Rectangle(texture=self.gradient_texture)
         
         Window.bind(size=self._schedule_update)
         self.bind(size=self._schedule_update)
@@ -119,10 +371,10 @@ class OptimizedGradient(FloatLayout):
         self._create_gradient()
     
     def _schedule_update(self, *args):
-        """Debounce resize events to avoid recreating texture too often"""
+        """Debounce resize events into one geometry update per frame"""
         if not self._update_scheduled:
             self._update_scheduled = True
-            Clock.schedule_once(self._delayed_update, 0.3)
+            Clock.schedule_once(self._delayed_update, 0)
     
     def _delayed_update(self, dt):
         """Actually update after debounce delay"""
@@ -131,64 +383,46 @@ class OptimizedGradient(FloatLayout):
     
     def _create_gradient_texture(self):
         """Create gradient texture with reasonable resolution"""
-        # Use fixed reasonable resolution instead of scaling with window
-        gradient_height = 512  # Fixed size for better performance
-        gradient_data = []
-        
-        num_colors = len(self.gradient_colors)
-        
-        for y in range(gradient_height):
-            t = y / (gradient_height - 1)
-            t = t * t * (3.0 - 2.0 * t)  # Smoothstep
-            
-            segment = t * (num_colors - 1)
-            segment_index = min(int(segment), num_colors - 2)
-            local_t = segment - segment_index
-            local_t = local_t * local_t * (3.0 - 2.0 * local_t)
-            
-            color1 = self.gradient_colors[segment_index]
-            color2 = self.gradient_colors[segment_index + 1]
-            
-            r = int((color1[0] + (color2[0] - color1[0]) * local_t) * 255)
-            g = int((color1[1] + (color2[1] - color1[1]) * local_t) * 255)
-            b = int((color1[2] + (color2[2] - color1[2]) * local_t) * 255)
-            
-            gradient_data.extend([r, g, b, 255])
+        if self.gradient_texture is not None:
+            return self.gradient_texture
+        
+        # The default ocean colors come precomputed; anything else is built here
+        if self.gradient_colors is OCEAN_GRADIENT_COLORS:
+            gradient_data = OCEAN_GRADIENT_RGBA
+        else:
+            gradient_data = gradient_rgba(self.gradient_colors, GRADIENT_HEIGHT)
+        gradient_height = len(gradient_data)
         
         texture = Texture.create(size=(1, gradient_height))
         texture.mag_filter = 'linear'
         texture.min_filter = 'linear'
-        texture.blit_buffer(bytes(gradient_data), colorfmt='rgba', bufferfmt='ubyte')
+        texture.blit_buffer(memoryview(gradient_data), colorfmt='rgba', bufferfmt='ubyte')
         return texture
     
     def _create_gradient(self, *args):
-        """Create gradient background"""
+        """Stretch the cached gradient over the window"""
         if Window.width <= 0 or Window.height <= 0:
             return
         
-        self.canvas.before.clear()
-        
-        if not self.gradient_texture:
-            self.gradient_texture = self._create_gradient_texture()
-        
-        with self.canvas.before:
-            Color(1, 1, 1, 1)
-            Rectangle(
-                texture=self.gradient_texture,
-                pos=(0, 0),
-                size=(Window.width, Window.height)
-            )
+        self.gradient_instruction.pos = (0, 0)
+        self.gradient_instruction.size = (Window.width, Window.height)
 
 
 def create_animated_background() -> FloatLayout:
     """Create optimized animated background"""
     background = OptimizedGradient()
     
-    wave_widget = OptimizedWaveWidget(
-        size_hint=(1, 0.6),
-        pos_hint={'x': 0, 'y': 0}
-    )
+    # Prefer per-pixel GPU waves, fall back to CPU-built meshes on GL drivers
+    # that reject the shader, and to a plain gradient if neither compiles
+    wave_widget = None
+    for wave_class in (ShaderWaveWidget, OptimizedWaveWidget):
+        try:
+            wave_widget = wave_class(size_hint=(1, 0.6), pos_hint={'x': 0, 'y': 0})
+            break
+        except RuntimeError as e:
+            log.warning("%s unavailable: %s", wave_class.__name__, e)
     
-    background.add_widget(wave_widget)
+    if wave_widget is not None:
+        background.add_widget(wave_widget)
     background.wave_widget = wave_widget  # Store reference for stopping animation
     return background
\ No newline at end of file
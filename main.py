@@ -3,23 +3,48 @@ Main Application File - Fixed Version
 Orchestrates the Stock Risk Analyzer app using modular components with improved error handling
 """
 import sys
+import hashlib
+import logging
 import subprocess
-import pkg_resources
+import importlib.util
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-# Auto-install required packages
+log = logging.getLogger("fin_alpha")
+
+# Written once every dependency has been found, so later launches skip the check.
+# Keyed on the interpreter and environment: a new venv or Python version has
+# none of the packages and must run the check again
+_ENV_KEY = hashlib.sha1(f"{sys.executable}\0{sys.prefix}\0{sys.version}".encode()).hexdigest()[:16]
+DEPS_SENTINEL = Path.home() / ".cache" / "fin-alpha" / f"deps-{_ENV_KEY}.ok"
+
+# Auto-install required packages (pip name -> importable module)
 def install_missing_packages():
-    required = {'kivy', 'yfinance', 'numpy', 'setuptools', 'matplotlib', 'kivy-garden', 'kivy_garden.matplotlib', 'Pillow'}
-    try:
-        import pkg_resources
-    except ImportError:
-        print("Installing setuptools for pkg_resources...")
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'setuptools'])
-        import pkg_resources
-    installed = {pkg.key for pkg in pkg_resources.working_set}
-    missing = required - installed
+    if DEPS_SENTINEL.exists():
+        return
+    required = {
+        'kivy': 'kivy',
+        'yfinance': 'yfinance',
+        'numpy': 'numpy',
+        'setuptools': 'setuptools',
+        'Pillow': 'PIL',
+    }
+    missing = []
+    for package, module in required.items():
+        try:
+            found = importlib.util.find_spec(module) is not None
+        except ImportError:  # a broken install can make find_spec itself raise
+            found = False
+        if not found:
+            missing.append(package)
     if missing:
         print(f"Installing missing packages: {', '.join(missing)}")
         subprocess.check_call([sys.executable, '-m', 'pip', 'install', *missing])
+    try:
+        DEPS_SENTINEL.parent.mkdir(parents=True, exist_ok=True)
+        DEPS_SENTINEL.touch()
+    except OSError as e:
+        log.warning("Could not write dependency marker: %s", e)
 
 install_missing_packages()
 
@@ -34,9 +59,12 @@ Config.set('graphics', 'minimum_height', '600')
 
 # Import our custom modules
 from risk import StockRiskAnalyzer
-from ui import StockAnalyzerLayout, create_main_ui  # Add create_main_ui to imports
+from ui import StockAnalyzerLayout, create_main_ui, shutdown_executors  # Add create_main_ui to imports
 from background import create_animated_background
 
+# Tickers suggested in the UI, fetched ahead of time so the first analysis is quick
+PREFETCH_TICKERS = ["AAPL", "GOOGL", "TSLA", "MSFT", "NVDA"]
+
 
 class StockRiskApp(App):
     """Main application class that coordinates all modules"""
@@ -47,9 +75,13 @@ class StockRiskApp(App):
         # Initialize the risk analyzer
         self.risk_analyzer = StockRiskAnalyzer()
         
+        # Network-bound analysis runs here so the UI thread keeps rendering
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        
         # UI components (will be set in build method)
         self.main_layout = None
         self.screen_manager = None
+        self.analyzer_layout = None
     
     def build(self):
         """Build and return the main application widget"""
@@ -64,9 +96,9 @@ class StockRiskApp(App):
         # Create screen manager with all screens
         self.screen_manager = create_main_ui()
         
-        # Get reference to main screen's layout for button binding
-        main_screen = self.screen_manager.get_screen('main')
-        main_screen.layout.bind_analyze_button(self.on_analyze_button_pressed)
+        # Keep a reference to the main screen's layout for button binding and results
+        self.analyzer_layout = self.screen_manager.get_screen('main').layout
+        self.analyzer_layout.bind_analyze_button(self.on_analyze_button_pressed)
         
         # Add screen manager to main layout
         self.main_layout.add_widget(self.screen_manager)
@@ -75,53 +107,60 @@ class StockRiskApp(App):
     
     def on_analyze_button_pressed(self, instance):
         """Handle analyze button press with validation"""
-        main_screen = self.screen_manager.get_screen('main')
-        ticker = main_screen.layout.get_ticker_input()
+        layout = self.analyzer_layout
+        ticker = layout.get_ticker_input()
         
         # Validation
         if not ticker:
-            main_screen.layout.set_result_text(
+            layout.set_result_text(
                 "Please enter a ticker symbol\n\nExample: AAPL, GOOGL, TSLA",
                 "warning"
             )
             return
         
-        if len(ticker) < 1 or len(ticker) > 10:
-            main_screen.layout.set_result_text(f"Invalid ticker: {ticker}\n\nShould be 1-10 characters.", "warning")
+        if not self.risk_analyzer.validate_ticker(ticker):
+            layout.set_result_text(
+                f"Invalid ticker: {ticker}\n\nShould be 1-10 letters, digits or . - = ^",
+                "warning"
+            )
             return
         
         # Start analysis
-        main_screen.layout.set_loading_state(True)
-        Clock.schedule_once(lambda dt: self._perform_analysis(ticker), 0.1)
+        layout.set_loading_state(True)
+        self._perform_analysis(ticker)
     
     def _perform_analysis(self, ticker: str):
-        """Perform stock analysis with error handling"""
+        """Start stock analysis on a worker thread"""
+        layout = self.analyzer_layout
+        layout.set_result_text(f"Fetching data for {ticker}...\n\nPlease wait.", "info")
+        
+        # Clock is thread-safe, so the done callback hands the result back to the UI thread
+        future = self._executor.submit(self.risk_analyzer.analyze_stock, ticker)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._render_analysis(ticker, f), 0)
+        )
+    
+    def _render_analysis(self, ticker: str, future):
+        """Show the finished analysis with error handling (runs on the UI thread)"""
+        layout = self.analyzer_layout
         try:
-            main_screen = self.screen_manager.get_screen('main')
-            main_screen.layout.set_result_text(f"Fetching data for {ticker}...\n\nPlease wait.", "info")
-            
-            # Analyze the stock
-            metrics = self.risk_analyzer.analyze_stock(ticker)
-            
-            if metrics:
-                result_text, risk_style = self.risk_analyzer.format_results(metrics)
-                main_screen.layout.set_result_text(result_text, risk_style)
-            else:
-                main_screen.layout.set_result_text(
-                    f"Unable to analyze {ticker}\n\nTicker may not exist. Try a different symbol.",
-                    "error"
-                )
+            metrics = future.result()
+            result_text, risk_style = self.risk_analyzer.format_results(metrics)
+            # The logo and details follow the ticker that was analyzed,
+            # not whatever is in the input box by now
+            layout.analyzed_ticker = ticker
+            layout.set_result_text(result_text, risk_style)
                 
         except ValueError as ve:
             error_msg = f"ERROR: {ticker}\n\n{str(ve)}\n\nTry: AAPL, GOOGL, MSFT"
-            main_screen.layout.set_result_text(error_msg, "error")
+            layout.set_result_text(error_msg, "error")
             
         except Exception as e:
             error_msg = f"ERROR: {ticker}\n\n{str(e)}\n\nCheck internet connection and try again."
-            main_screen.layout.set_result_text(error_msg, "error")
+            layout.set_result_text(error_msg, "error")
         
         finally:
-            main_screen.layout.set_loading_state(False)
+            layout.set_loading_state(False)
     
     def on_start(self):
         """Called when the app starts"""
@@ -140,20 +179,31 @@ Features:
 
 Start by entering a ticker symbol above!"""
         
-        # Get reference to main screen's layout
-        main_screen = self.screen_manager.get_screen('main')
-        main_screen.layout.set_result_text(welcome_text, "info")
+        self.analyzer_layout.set_result_text(welcome_text, "info")
+        
+        # Warm the price cache with the example tickers while the user is reading
+        self._executor.submit(self._prefetch_popular)
+    
+    def _prefetch_popular(self):
+        """Download the example tickers in the background (runs on a worker thread)"""
+        for ticker in PREFETCH_TICKERS:
+            try:
+                self.risk_analyzer._fetch_stock_data(ticker, "1y")
+            except Exception as e:
+                log.warning("Prefetch skipped %s: %s", ticker, e)
     
     def on_stop(self):
         """Clean up when app is closing"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        shutdown_executors()
         try:
             # Stop any background animations to free resources
             if self.main_layout:
                 for child in self.main_layout.children:
                     if hasattr(child, 'stop_animation'):
                         child.stop_animation()
-        except Exception as e:
-            print(f"Error during app cleanup: {e}")
+        except Exception:
+            log.exception("Error during app cleanup")
     
     def on_pause(self):
         """Handle app pause (mobile)"""
@@ -167,8 +217,8 @@ Start by entering a ticker symbol above!"""
                 for child in self.main_layout.children:
                     if hasattr(child, 'start_animation'):
                         child.start_animation()
-        except Exception as e:
-            print(f"Error during app resume: {e}")
+        except Exception:
+            log.exception("Error during app resume")
 
 
 def main():
@@ -3,10 +3,126 @@ Risk Analysis Module - Fixed Version
 Handles all stock data fetching and risk calculations with improved formatting
 """
 
-import yfinance as yf
+import logging
+import math
+import re
+import time
+import threading
 import numpy as np
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Dict, Any, Iterable, Iterator
+
+
+log = logging.getLogger("fin_alpha")
+
+# Recent downloads shared by every analyzer: (ticker, period) -> (fetched_at, data)
+_PRICE_CACHE: Dict[tuple, tuple] = {}
+
+# yf.Ticker objects by symbol, shared by every analyzer. They ride on yfinance's
+# shared HTTP session, so reusing them keeps connections and the cookie/crumb warm
+_TICKERS: Dict[str, Any] = {}
+
+# Most symbols Yahoo answers in one download request
+_BATCH_SIZE = 20
+
+# Downloads kept in flight ahead of the ticker being computed in analyze_stock_stream
+_PREFETCH_DEPTH = 2
+
+# Daily figures are annualized over 252 trading days
+_TRADING_DAYS = 252
+_SQRT_252 = math.sqrt(_TRADING_DAYS)
+
+# Left-tail quantiles reported as VaR (99%) and VaR (95%)
+_VAR_QUANTILES = (0.01, 0.05)
+
+# Risk level and style for each band between the volatility thresholds
+_RISK_LEVELS = (("LOW", "low"), ("MEDIUM", "medium"), ("HIGH", "high"))
+
+# Letters, digits and the punctuation Yahoo uses (BRK-B, HG=F, ^GSPC, RY.TO)
+_TICKER_RE = re.compile(r"[A-Z0-9.\-=^]{1,10}")
+
+# Summary shown in the main screen, filled in by format_results
+_RESULT_TMPL = (
+    "RISK METRICS:\n"
+    "• Annual Volatility: {volatility:.1f}%\n"
+    "• Value at Risk (95%): {var_95:.2f}% daily\n"
+    "• Value at Risk (99%): {var_99:.2f}% daily\n"
+    "• Maximum Drawdown: {max_drawdown:.1f}%\n"
+    "• Sharpe Ratio: {sharpe_ratio:.2f}\n\n"
+    "Risk Level: {risk_level}"
+)
+
+
+# Long-form report, filled in by format_results_detailed
+_DETAILED_TMPL = """DETAILED ANALYSIS FOR {m.ticker}
+
+Current Price: ${m.current_price:.2f}
+
+RISK METRICS EXPLAINED:
+
+Annual Volatility: {m.volatility:.1%}
+   {explanations[volatility]}
+
+Value at Risk (95%): {m.var_95:.2%} daily
+   {explanations[var_95]}
+
+Value at Risk (99%): {m.var_99:.2%} daily
+   {explanations[var_99]}
+
+Maximum Drawdown: {m.max_drawdown:.1%}
+   {explanations[max_drawdown]}
+
+Sharpe Ratio: {m.sharpe_ratio:.2f}
+   {explanations[sharpe_ratio]}
+
+Risk Level: {m.risk_level}
+
+{interpretation}"""
+
+
+def _risk_kernel(returns: np.ndarray, growth: np.ndarray, peak: np.ndarray) -> tuple:
+    """
+    Compute the daily return statistics, reusing caller-owned scratch arrays
+    
+    growth and peak are scratch arrays of the same length as returns; their
+    contents are overwritten.
+    
+    Returns:
+        tuple: (mean, std, var_99, var_95, max_drawdown) as Python floats
+    """
+    n = len(returns)
+    mean = float(returns.mean())
+    # Sample (ddof=1) standard deviation, as pandas computed it. Taking it from
+    # the deviations reuses the mean instead of np.std recomputing it
+    np.subtract(returns, mean, out=growth)
+    std = math.sqrt(float(np.dot(growth, growth)) / (n - 1))
+    
+    # VaR: np.percentile's linear interpolation only needs the order statistics
+    # either side of q * (n - 1), so partition a copy around those instead of sorting
+    positions = [q * (n - 1) for q in _VAR_QUANTILES]
+    kth = sorted({k for pos in positions for k in (int(pos), min(int(pos) + 1, n - 1))})
+    np.copyto(growth, returns)
+    growth.partition(kth)
+    quantiles = []
+    for pos in positions:
+        lo = int(pos)
+        hi = min(lo + 1, n - 1)
+        quantiles.append(float(growth[lo] + (growth[hi] - growth[lo]) * (pos - lo)))
+    var_99, var_95 = quantiles
+    
+    # Max drawdown: compound the growth curve in place and reuse the running
+    # peak buffer for the ratio; (peak - growth) / peak is largest where
+    # growth / peak is smallest
+    np.add(returns, 1.0, out=growth)
+    np.cumprod(growth, out=growth)
+    np.maximum.accumulate(growth, out=peak)
+    np.divide(growth, peak, out=peak)
+    max_drawdown = float(1.0 - peak.min())
+    
+    return mean, std, var_99, var_95, max_drawdown
 
 
 @dataclass
@@ -26,13 +142,42 @@ class RiskMetrics:
 class StockRiskAnalyzer:
     """Main class for stock risk analysis"""
     
+    _EXPLANATIONS = {
+        'volatility': "Measures how much the stock price fluctuates",
+        'var_95': "Maximum expected daily loss 95% of the time",
+        'var_99': "Maximum expected daily loss 99% of the time",
+        'max_drawdown': "Largest peak-to-trough decline",
+        'sharpe_ratio': "Risk-adjusted return (higher is better)"
+    }
+    
+    _INTERPRETATIONS = {
+        "LOW": "This stock has relatively low volatility and is considered less risky.",
+        "MEDIUM": "This stock has moderate volatility. Consider your risk tolerance.",
+        "HIGH": "This stock is highly volatile and risky. Only suitable for risk-tolerant investors."
+    }
+    
     def __init__(self):
         self.risk_thresholds = {
             'high': 0.4,
             'medium': 0.2
         }
+        
+        # Downloads younger than this are served from _PRICE_CACHE
+        self.cache_ttl = 15 * 60  # seconds
+        
+        # Per-thread drawdown buffers, analyses can run on several workers at once
+        self._scratch = threading.local()
     
-    def analyze_stock(self, ticker: str, period: str = "1y") -> Optional[RiskMetrics]:
+    @staticmethod
+    def validate_ticker(ticker: str) -> bool:
+        """Check that ticker looks like a Yahoo Finance symbol before hitting the network"""
+        return _TICKER_RE.fullmatch(ticker.strip().upper()) is not None
+    
+    def clear_cache(self):
+        """Drop cached price data so the next analysis refetches from Yahoo Finance"""
+        _PRICE_CACHE.clear()
+    
+    def analyze_stock(self, ticker: str, period: str = "1y") -> RiskMetrics:
         """
         Analyze stock risk metrics for given ticker
         
@@ -41,68 +186,166 @@ class StockRiskAnalyzer:
             period (str): Time period for analysis (default: 1y)
             
         Returns:
-            RiskMetrics: Analysis results or None if error
+            RiskMetrics: Analysis results
             
         Raises:
             ValueError: If ticker is invalid or insufficient data
-            Exception: For other data fetching errors
+            Exception: Data fetching errors, with their original type
         """
-        try:
-            # Download stock data
-            data = self._fetch_stock_data(ticker, period)
-            
-            # Calculate returns
-            returns = self._calculate_returns(data)
-            
-            # Calculate risk metrics
-            metrics = self._calculate_risk_metrics(ticker, data, returns)
-            
-            return metrics
-            
-        except Exception as e:
-            raise Exception(f"Analysis failed: {str(e)}")
+        # No try/except: errors keep their original type so callers can tell
+        # bad input (ValueError) apart from network failures
+        data = self._fetch_stock_data(ticker, period)
+        
+        # Calculate returns
+        returns = self._calculate_returns(data)
+        
+        # Calculate risk metrics
+        return self._calculate_risk_metrics(ticker, data, returns)
     
     def _fetch_stock_data(self, ticker: str, period: str) -> Any:
-        """Fetch stock data from Yahoo Finance"""
-        data = yf.download(ticker, period=period, progress=False, auto_adjust=True)
+        """Fetch stock data from Yahoo Finance, reusing downloads younger than cache_ttl"""
+        key = (ticker.upper(), period)
+        cached = _PRICE_CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            # Shallow copy so callers can't reshape the cached frame
+            return cached[1].copy(deep=False)
+        
+        ticker_obj = _TICKERS.get(key[0])
+        if ticker_obj is None:
+            # Imported here because yfinance drags in pandas and friends,
+            # which would otherwise slow down app startup
+            import yfinance as yf
+            ticker_obj = _TICKERS[key[0]] = yf.Ticker(key[0])
+        data = ticker_obj.history(period=period, auto_adjust=True, actions=False, prepost=False)
+        # Only Close is used, so keep (and cache) just that column
+        data = data[["Close"]]
         
         if data.empty:
             raise ValueError("No data found for this ticker")
-            
+        
+        _PRICE_CACHE[key] = (time.monotonic(), data)
         return data
     
+    def analyze_portfolio(self, tickers: list[str], period: str = "1y") -> Dict[str, RiskMetrics]:
+        """
+        Analyze several tickers using batched Yahoo Finance downloads
+        
+        Args:
+            tickers (list[str]): Stock ticker symbols
+            period (str): Time period for analysis (default: 1y)
+            
+        Returns:
+            dict: RiskMetrics keyed by upper-case ticker; tickers that fail are skipped
+        """
+        import yfinance as yf
+        
+        symbols = list(dict.fromkeys(t.strip().upper() for t in tickers))
+        frames = {}
+        
+        # Fresh cache entries need no download at all
+        now = time.monotonic()
+        for ticker in symbols:
+            cached = _PRICE_CACHE.get((ticker, period))
+            if cached and now - cached[0] < self.cache_ttl:
+                frames[ticker] = cached[1]
+        pending = [t for t in symbols if t not in frames]
+        
+        # Yahoo serves about 20 symbols per request. yf.download keeps its results
+        # in module globals, so batches run one after another and rely on
+        # threads=True for the fan-out inside each batch
+        for start in range(0, len(pending), _BATCH_SIZE):
+            batch = pending[start:start + _BATCH_SIZE]
+            data = yf.download(batch, period=period, group_by='ticker', progress=False,
+                               auto_adjust=True, actions=False, threads=True)
+            for ticker in batch:
+                try:
+                    sub = data[ticker] if data.columns.nlevels > 1 else data
+                except KeyError:
+                    continue
+                # Calendars differ between markets (crypto trades weekends),
+                # so drop the rows where this ticker has no close
+                sub = sub[["Close"]].dropna()
+                if not sub.empty:
+                    _PRICE_CACHE[(ticker, period)] = (time.monotonic(), sub)
+                    frames[ticker] = sub
+        
+        results = {}
+        for ticker in symbols:
+            try:
+                sub = frames.get(ticker)
+                if sub is None:
+                    raise ValueError("No data found for this ticker")
+                returns = self._calculate_returns(sub)
+                results[ticker] = self._calculate_risk_metrics(ticker, sub, returns)
+            except Exception as e:
+                log.warning("Skipping %s: %s", ticker, e)
+        
+        return results
+    
+    def analyze_stock_stream(self, tickers: Iterable[str], period: str = "1y") -> Iterator[RiskMetrics]:
+        """
+        Yield RiskMetrics for each ticker in order, downloading ahead
+        
+        While one ticker's metrics are computed, the next _PREFETCH_DEPTH
+        tickers are already being fetched on worker threads. Tickers that
+        fail are logged and skipped.
+        """
+        remaining = iter(tickers)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=_PREFETCH_DEPTH) as executor:
+            def queue_next():
+                ticker = next(remaining, None)
+                if ticker is not None:
+                    pending.append((ticker, executor.submit(self._fetch_stock_data, ticker, period)))
+            
+            for _ in range(_PREFETCH_DEPTH):
+                queue_next()
+            while pending:
+                ticker, future = pending.popleft()
+                queue_next()
+                try:
+                    data = future.result()
+                    returns = self._calculate_returns(data)
+                    metrics = self._calculate_risk_metrics(ticker, data, returns)
+                except Exception as e:
+                    log.warning("Skipping %s: %s", ticker, e)
+                    continue
+                yield metrics
+    
     def _calculate_returns(self, data: Any) -> np.ndarray:
         """Calculate daily returns from price data"""
-        returns = data["Close"].pct_change().dropna()
+        # Close can come back as a one-column frame, flatten it and skip gaps.
+        # float32 keeps ~7 significant digits, far more than the 1-2 decimal
+        # percentages the metrics are shown with
+        close = np.asarray(data["Close"], dtype=np.float32).ravel()
+        gaps = np.isnan(close)
+        if gaps.any():
+            close = close[~gaps]
         
-        if len(returns) < 30:
+        # Check before doing any arithmetic, n prices give n - 1 returns
+        if close.size - 1 < 30:
             raise ValueError("Insufficient data for analysis (need at least 30 days)")
-            
+        
+        # Ratio then subtract in place: one temporary instead of diff + divide
+        returns = close[1:] / close[:-1]
+        returns -= 1.0
         return returns
     
     def _calculate_risk_metrics(self, ticker: str, data: Any, returns: np.ndarray) -> RiskMetrics:
         """Calculate all risk metrics"""
-        # Basic metrics - using .item() to avoid deprecation warnings
-        current_price = data["Close"].iloc[-1]
-        if hasattr(current_price, 'item'):
-            current_price = current_price.item()
-        
-        volatility = (returns.std() * np.sqrt(252)).item()  # Annualized
+        # Basic metrics - .iat is the scalar fast path, float() avoids numpy scalars
+        current_price = float(data["Close"].iat[-1])
         
-        # Value at Risk calculations
-        var_95 = float(np.percentile(returns, 5))  # 5th percentile
-        var_99 = float(np.percentile(returns, 1))  # 1st percentile
+        # All array work happens in _risk_kernel, on this thread's scratch buffers
+        mean, std, var_99, var_95, max_drawdown = _risk_kernel(
+            returns, *self._scratch_buffers(len(returns))
+        )
         
-        # Maximum drawdown
-        cumulative_returns = (returns + 1).cumprod()
-        peak = cumulative_returns.cummax()
-        drawdown = (peak - cumulative_returns) / peak
-        max_drawdown = drawdown.max().item()
+        volatility = std * _SQRT_252  # Annualized
         
         # Sharpe ratio (assuming risk-free rate of 0)
-        annual_return = (returns.mean() * 252).item()
-        annual_volatility = (returns.std() * np.sqrt(252)).item()
-        sharpe_ratio = annual_return / annual_volatility if annual_volatility > 0 else 0
+        annual_return = mean * _TRADING_DAYS
+        sharpe_ratio = annual_return / volatility if volatility > 0 else 0
         
         # Determine risk level
         risk_level, risk_color = self._determine_risk_level(volatility)
@@ -119,14 +362,18 @@ class StockRiskAnalyzer:
             risk_color=risk_color
         )
     
+    def _scratch_buffers(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """Two float32 views of length n from this thread's reusable buffer"""
+        buf = getattr(self._scratch, 'buf', None)
+        if buf is None or buf.shape[1] < n:
+            buf = self._scratch.buf = np.empty((2, max(n, 512)), dtype=np.float32)
+        return buf[0, :n], buf[1, :n]
+    
     def _determine_risk_level(self, volatility: float) -> tuple[str, str]:
         """Determine risk level based on volatility"""
-        if volatility > self.risk_thresholds['high']:
-            return "HIGH", "high"
-        elif volatility > self.risk_thresholds['medium']:
-            return "MEDIUM", "medium"
-        else:
-            return "LOW", "low"
+        # Count the thresholds volatility is strictly above: 0 low, 1 medium, 2 high
+        bounds = (self.risk_thresholds['medium'], self.risk_thresholds['high'])
+        return _RISK_LEVELS[bisect_left(bounds, volatility)]
     
     def format_results(self, metrics):
         """Format risk metrics with consistent risk level"""
@@ -136,73 +383,44 @@ class StockRiskAnalyzer:
         # Use consistent risk level determination
         risk_style = "risk-high" if volatility > 50 else "risk-medium" if volatility > 30 else "risk-low"
         
-        result_text = (
-            "RISK METRICS:\n"
-            f"• Annual Volatility: {volatility:.1f}%\n"
-            f"• Value at Risk (95%): {metrics.var_95 * 100:.2f}% daily\n"
-            f"• Value at Risk (99%): {metrics.var_99 * 100:.2f}% daily\n"
-            f"• Maximum Drawdown: {metrics.max_drawdown * 100:.1f}%\n"
-            f"• Sharpe Ratio: {metrics.sharpe_ratio:.2f}\n\n"
-            f"Risk Level: {metrics.risk_level}"
-        )
+        result_text = _RESULT_TMPL.format_map({
+            'volatility': volatility,
+            'var_95': metrics.var_95 * 100,
+            'var_99': metrics.var_99 * 100,
+            'max_drawdown': metrics.max_drawdown * 100,
+            'sharpe_ratio': metrics.sharpe_ratio,
+            'risk_level': metrics.risk_level,
+        })
         return result_text, risk_style  # Return both text and style
 
     def format_results_detailed(self, metrics: RiskMetrics) -> str:
         """Format risk metrics with detailed explanations"""
-        explanations = {
-            'volatility': "Measures how much the stock price fluctuates",
-            'var_95': "Maximum expected daily loss 95% of the time",
-            'var_99': "Maximum expected daily loss 99% of the time", 
-            'max_drawdown': "Largest peak-to-trough decline",
-            'sharpe_ratio': "Risk-adjusted return (higher is better)"
-        }
-        
-        return f"""DETAILED ANALYSIS FOR {metrics.ticker}
-
-Current Price: ${metrics.current_price:.2f}
-
-RISK METRICS EXPLAINED:
-
-Annual Volatility: {metrics.volatility:.1%}
-   {explanations['volatility']}
-
-Value at Risk (95%): {metrics.var_95:.2%} daily
-   {explanations['var_95']}
-
-Value at Risk (99%): {metrics.var_99:.2%} daily
-   {explanations['var_99']}
-
-Maximum Drawdown: {metrics.max_drawdown:.1%}
-   {explanations['max_drawdown']}
-
-Sharpe Ratio: {metrics.sharpe_ratio:.2f}
-   {explanations['sharpe_ratio']}
-
-Risk Level: {metrics.risk_level}
-
-{self._get_risk_interpretation(metrics.risk_level)}"""
+        return _DETAILED_TMPL.format(
+            m=metrics,
+            explanations=self._EXPLANATIONS,
+            interpretation=self._get_risk_interpretation(metrics.risk_level)
+        )
 
     def _get_risk_interpretation(self, risk_level: str) -> str:
         """Get risk level interpretation"""
-        interpretations = {
-            "LOW": "This stock has relatively low volatility and is considered less risky.",
-            "MEDIUM": "This stock has moderate volatility. Consider your risk tolerance.",
-            "HIGH": "This stock is highly volatile and risky. Only suitable for risk-tolerant investors."
-        }
-        return interpretations.get(risk_level, "Risk level assessment unavailable.")
+        return self._INTERPRETATIONS.get(risk_level, "Risk level assessment unavailable.")
+
 
+# Convenience functions for easy usage. They share one analyzer so its
+# scratch buffers carry over between calls
+_DEFAULT_ANALYZER = StockRiskAnalyzer()
 
-# Convenience functions for easy usage
-def analyze_stock_risk(ticker: str) -> Optional[RiskMetrics]:
+
+def analyze_stock_risk(ticker: str) -> RiskMetrics:
     """Quick function to analyze stock risk"""
-    analyzer = StockRiskAnalyzer()
+    analyzer = _DEFAULT_ANALYZER
     return analyzer.analyze_stock(ticker)
 
 
 def get_formatted_analysis(ticker: str, detailed: bool = False) -> str:
     """Get formatted analysis results"""
     try:
-        analyzer = StockRiskAnalyzer()
+        analyzer = _DEFAULT_ANALYZER
         metrics = analyzer.analyze_stock(ticker)
         
         if detailed:
@@ -216,7 +434,7 @@ def get_formatted_analysis(ticker: str, detailed: bool = False) -> str:
 def get_risk_summary(ticker: str) -> str:
     """Get a quick risk summary"""
     try:
-        analyzer = StockRiskAnalyzer()
+        analyzer = _DEFAULT_ANALYZER
         metrics = analyzer.analyze_stock(ticker)
 
         return f"""Quick Summary for {metrics.ticker}:
@@ -227,6 +445,25 @@ Risk: {metrics.risk_level}"""
         return f"Unable to analyze {ticker}: {str(e)}"
 
 
+def analyze_stock_risk_many(tickers: list[str], max_workers: int = 8) -> Dict[str, RiskMetrics]:
+    """Analyze several tickers concurrently; tickers that fail are skipped"""
+    analyzer = _DEFAULT_ANALYZER
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers))
+    results = {}
+    
+    # Fetches are network-bound and release the GIL, so threads overlap them
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(analyzer.analyze_stock, t): t for t in symbols}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                log.warning("Skipping %s: %s", ticker, e)
+    
+    return results
+
+
 def get_top_low_risk_stocks(limit: int = 5) -> list[RiskMetrics]:
     """Get top low-risk stocks sorted by volatility (lowest first)"""
     # Predefined list of popular stocks to analyze
@@ -237,17 +474,8 @@ def get_top_low_risk_stocks(limit: int = 5) -> list[RiskMetrics]:
         'HG=F', 'GC=F', 'SI=F', 'CL=F', 'BTC-USD', 'ETH-USD'
     ]
 
-    analyzer = StockRiskAnalyzer()
-    results = []
-
-    for ticker in popular_stocks:
-        try:
-            metrics = analyzer.analyze_stock(ticker)
-            if metrics:
-                results.append(metrics)
-        except Exception as e:
-            print(f"Skipping {ticker}: {e}")
-            continue
+    analyzer = _DEFAULT_ANALYZER
+    results = list(analyzer.analyze_portfolio(popular_stocks).values())
 
     # Sort by volatility ascending (lowest first)
     results.sort(key=lambda x: x.volatility)
@@ -12,18 +12,447 @@ from kivy.uix.label import Label
 from kivy.uix.image import Image
 from kivy.graphics import Color, RoundedRectangle, Line, StencilPush, StencilPop, StencilUse, Ellipse
 from kivy.core.window import Window
+from kivy.clock import Clock
 from kivy.properties import ObjectProperty
 from kivy.uix.screenmanager import ScreenManager, Screen, SlideTransition
 from kivy.uix.widget import Widget
 from kivy.uix.image import Image as KivyImage
 from kivy.graphics.texture import Texture
+from kivy.core.image import Image as CoreImage
 import io
-import matplotlib
-matplotlib.use('module://kivy_garden.matplotlib.backend_kivy')
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from kivy_garden.matplotlib.backend_kivyagg import FigureCanvasKivyAgg
-import yfinance as yf
+import re
+import logging
+import time
+import threading
+from functools import partial
+from io import BytesIO
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+log = logging.getLogger("fin_alpha")
+# yfinance and requests are imported where they're used: they add noticeably
+# to startup, and the UI is up before any lookup is needed
+
+# Ticker.info is a slow scrape, keep results per ticker: ticker -> (fetched_at, info)
+_INFO_CACHE = {}
+INFO_TTL = 300  # seconds
+
+
+def get_info(ticker: str, ttl: float = INFO_TTL) -> dict:
+    """Return yfinance info for ticker, reusing lookups younger than ttl seconds"""
+    key = ticker.upper()
+    cached = _INFO_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    
+    import yfinance as yf
+    info = yf.Ticker(key).info
+    _INFO_CACHE[key] = (time.monotonic(), info)
+    return info
+
+
+# Chart history, same idea: (ticker, period) -> (fetched_at, Close-only frame)
+_HISTORY_CACHE = {}
+HISTORY_TTL = 300  # seconds
+
+
+def get_history(ticker: str, period: str, ttl: float = HISTORY_TTL):
+    """Return the Close history for ticker over period, reusing fetches younger than ttl seconds"""
+    key = (ticker.upper(), period)
+    cached = _HISTORY_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+    
+    import yfinance as yf
+    # Only Close is plotted, so that is all that is kept
+    hist = yf.Ticker(key[0]).history(period=period)[['Close']].copy()
+    if not hist.empty:
+        _HISTORY_CACHE[key] = (time.monotonic(), hist)
+    return hist
+
+
+# Chart history is fetched here so opening a chart never blocks the UI thread
+_CHART_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chart")
+
+
+def prefetch_info(tickers) -> None:
+    """Fill _INFO_CACHE for several tickers at once, fetching them in parallel"""
+    # Yahoo has no batched info endpoint, so overlap the per-ticker requests:
+    # the wait becomes the slowest lookup instead of the sum of all of them
+    tickers = list(tickers)
+    if not tickers:
+        return
+    with ThreadPoolExecutor(max_workers=len(tickers)) as executor:
+        for ticker, future in [(t, executor.submit(get_info, t)) for t in tickers]:
+            try:
+                future.result()
+            except Exception as e:
+                log.warning("Could not prefetch info for %s: %s", ticker, e)
+
+
+# Logo downloads from every screen share these threads rather than each
+# ticker starting (and tearing down) a pool of its own
+_LOGO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="logo")
+
+
+def shutdown_executors():
+    """Drop queued chart and logo work so the app can exit without waiting on it"""
+    for executor in (_CHART_EXECUTOR, _LOGO_EXECUTOR):
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# One session for all logo requests so fallbacks to the same host reuse the
+# open connection instead of paying for a new TLS handshake. The pool is
+# larger than _LOGO_EXECUTOR so no worker ever waits on, or discards, a connection.
+# A pooled connection the server already closed fails on first use, so allow
+# one immediate retry (reads included) rather than losing that candidate
+_HTTP = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _http():
+    """The shared logo session, created on the first logo fetch"""
+    global _HTTP
+    with _HTTP_LOCK:
+        if _HTTP is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=1, backoff_factor=0))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _HTTP = session
+    return _HTTP
+
+# Content types worth downloading; anything else (SVG, HTML error pages) is skipped
+_RASTER_TYPES = ('image/png', 'image/jpeg', 'image/gif', 'image/webp')
+
+# No real logo comes close to this; a bigger body is a misbehaving endpoint
+LOGO_MAX_BYTES = 512 * 1024
+
+
+# Statuses that say the logo really isn't there; anything else that isn't a
+# 200 (403, 429, 5xx...) may be temporary and is raised as an error instead
+_MISSING_STATUSES = (404, 410)
+
+
+def _check_logo_status(url: str, response) -> bool:
+    """True for a 200, False for a definite miss, HTTPError for anything else"""
+    if response.status_code == 200:
+        return True
+    if response.status_code in _MISSING_STATUSES:
+        log.debug("No logo at %s, status %s", url, response.status_code)
+        return False
+    from requests import HTTPError
+    raise HTTPError(f"status {response.status_code}", response=response)
+
+
+def probe_logo(url: str) -> bool:
+    """HEAD a logo URL and report whether it looks like a raster image worth downloading"""
+    head = _http().head(url, timeout=2, allow_redirects=True)
+    # Some CDNs don't implement HEAD; only the GET can tell for those
+    if head.status_code in (405, 501):
+        return True
+    if not _check_logo_status(url, head):
+        return False
+    content_type = head.headers.get('Content-Type', '')
+    if content_type and not content_type.startswith(_RASTER_TYPES):
+        log.debug("Skipping %s logo from %s", content_type, url)
+        return False
+    return True
+
+
+def fetch_logo(url: str, timeout: float = 3):
+    """Download a logo's bytes, or None if it is missing or oversized"""
+    # Stream the body so an oversized one is abandoned instead of read into memory
+    with _http().get(url, timeout=timeout, stream=True) as response:
+        if not _check_logo_status(url, response):
+            return None
+        content = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            content += chunk
+            if len(content) > LOGO_MAX_BYTES:
+                log.warning("Skipping logo from %s, larger than %d bytes", url, LOGO_MAX_BYTES)
+                return None
+    return bytes(content)
+
+
+def race_logo_downloads(urls, timeout: float = 3):
+    """Probe every raster logo URL at once, yielding (url, content) for each one that downloads
+
+    Only HEAD requests go out in parallel; a body is fetched for the first URL
+    that passes, and for the next one only if the caller turns that down.
+    Returns True once every URL gave a definite answer (the image, 404/410,
+    not a raster image), False if any request failed or got a status that
+    may be temporary (timeout, no connection, 403, 429, 5xx)
+    """
+    # Kivy can't decode SVG, and anything that isn't an http(s) URL is skipped
+    urls = [u for u in urls if u.startswith('http') and not u.endswith('.svg')]
+    if not urls:
+        return False
+    
+    # The wait becomes the fastest good response instead of the sum of every miss
+    futures = {_LOGO_EXECUTOR.submit(probe_logo, url): url for url in urls}
+    answered = True
+    try:
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                if not future.result():
+                    continue
+                content = fetch_logo(url, timeout)
+            except Exception as e:
+                log.warning("Could not load logo from %s: %s", url, e)
+                answered = False
+                continue
+            if content is not None:
+                yield url, content
+    finally:
+        # Once the caller has its logo, drop the probes that haven't started
+        for future in futures:
+            future.cancel()
+    return answered
+
+
+def logo_sources(ticker: str, quote_type: str = None) -> list:
+    """Raster logo URLs worth trying for ticker, chosen by what kind of symbol it is"""
+    ticker = ticker.upper()
+    # Crypto pairs only exist on the crypto icon sets
+    if ticker.endswith("-USD") or quote_type == "CRYPTOCURRENCY":
+        base_ticker = ticker.split("-")[0].lower()
+        return [
+            f"https://cryptologos.cc/logos/{base_ticker}-{base_ticker}-logo.png",
+            f"https://raw.githubusercontent.com/spothq/cryptocurrency-icons/master/128/color/{base_ticker}.png",
+            f"https://cryptoicons.org/api/icon/{base_ticker}/200",
+        ]
+    # Everything else, funds and indices included, tries the raster company
+    # logo providers; the SVG-only ETF/index sets are left out since Kivy can't show them
+    return [
+        f"https://storage.googleapis.com/iex/api/logos/{ticker}.png",
+        f"https://img.logo.dev/{ticker.lower()}.com?token=pk_KJ6f8BqBRoW8cLxNfE8L8A",
+        f"https://companiesmarketcap.com/img/company-logos/64/{ticker}.png",
+        f"https://companieslogo.com/img/orig/{ticker}-logo.png",
+    ]
+
+
+# Leading bytes of the image formats Kivy can decode
+_RASTER_SIGNATURES = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a')
+
+
+def is_raster_image(content: bytes) -> bool:
+    """Cheap check that a download is a PNG/JPEG/GIF/WebP and not an HTML error page"""
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return True
+    return content.startswith(_RASTER_SIGNATURES)
+
+
+# Logos are shown at 60-100 px; CDNs often serve 512 px or more
+LOGO_TEXTURE_SIZE = 128
+
+
+def decode_logo(content: bytes, size: int = LOGO_TEXTURE_SIZE):
+    """Decode a logo into RGBA pixels no larger than size x size, so the GL texture stays small
+
+    Meant for worker threads. Returns (png, (width, height), pixels), png being
+    the bytes to keep on disk, or None if the image can't be decoded.
+    """
+    from PIL import Image as PILImage
+    
+    try:
+        with PILImage.open(BytesIO(content)) as image:
+            # The disk cache stores <TICKER>.png, so anything that isn't already
+            # a small PNG (JPEG, GIF, WebP, or too big) is re-encoded as one
+            keep_original = image.format == 'PNG' and image.width <= size and image.height <= size
+            image = image.convert('RGBA')
+            if not keep_original:
+                image.thumbnail((size, size), PILImage.LANCZOS)
+                buffer = BytesIO()
+                image.save(buffer, 'PNG')
+                content = buffer.getvalue()
+            return content, image.size, image.tobytes()
+    except Exception as e:
+        log.debug("Could not decode logo: %s", e)
+        return None
+
+
+def rgba_texture(size, pixels: bytes):
+    """Upload pixels from decode_logo as a texture; needs the GL context, so UI thread only"""
+    texture = Texture.create(size=size, colorfmt='rgba')
+    texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+    texture.flip_vertical()  # PIL rows run top to bottom, GL's bottom to top
+    return texture
+
+
+# Logos that decoded successfully, kept across runs as <TICKER>.png
+LOGO_CACHE_DIR = Path.home() / ".cache" / "fin-alpha" / "logos"
+# Tickers no provider had a logo for are marked with <TICKER>.miss and not
+# looked up again until the marker is this old
+LOGO_MISS_TTL = 7 * 24 * 60 * 60  # seconds
+# Files kept in LOGO_CACHE_DIR; the least recently used go first
+LOGO_CACHE_MAX_FILES = 256
+
+
+def _prune_logo_cache():
+    """Delete the least recently used cache files beyond LOGO_CACHE_MAX_FILES"""
+    try:
+        files = sorted(LOGO_CACHE_DIR.iterdir(), key=lambda f: f.stat().st_mtime)
+        for path in files[:-LOGO_CACHE_MAX_FILES]:
+            path.unlink()
+    except OSError as e:
+        log.warning("Could not prune logo cache: %s", e)
+
+
+def logo_candidates(ticker: str, urls):
+    """Yield (source, content) logo candidates for ticker, the on-disk copy first"""
+    path = LOGO_CACHE_DIR / f"{ticker.upper()}.png"
+    if path.exists():
+        try:
+            content = path.read_bytes()
+        except OSError as e:
+            log.warning("Could not read cached logo %s: %s", path, e)
+        else:
+            try:
+                path.touch()  # mtime doubles as last use for pruning
+            except OSError:
+                pass
+            yield str(path), content
+    
+    miss = LOGO_CACHE_DIR / f"{ticker.upper()}.miss"
+    try:
+        if time.time() - miss.stat().st_mtime < LOGO_MISS_TTL:
+            return
+    except OSError:
+        pass  # no marker
+    
+    # Getting here means the caller turned down every candidate. Only remember
+    # that when each provider actually answered, so being offline isn't cached
+    if (yield from race_logo_downloads(urls)):
+        try:
+            LOGO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            miss.touch()
+        except OSError as e:
+            log.warning("Could not cache missing logo for %s: %s", ticker, e)
+        else:
+            _prune_logo_cache()
+
+
+def save_logo(ticker: str, content: bytes):
+    """Keep a logo that decoded fine so later visits skip the network
+
+    Overwrites any cached copy: a download is only saved when the cached file
+    was missing or failed to decode.
+    """
+    path = LOGO_CACHE_DIR / f"{ticker.upper()}.png"
+    try:
+        LOGO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    except OSError as e:
+        log.warning("Could not cache logo for %s: %s", ticker, e)
+    else:
+        _prune_logo_cache()
+
+
+# Bundled logo shown when a ticker has none; decoded once, on the UI thread
+_FALLBACK_TEXTURE = None
+
+
+def fallback_logo_texture():
+    """Texture of Fin.png, loaded on first use and shared by every logo widget"""
+    global _FALLBACK_TEXTURE
+    if _FALLBACK_TEXTURE is None:
+        _FALLBACK_TEXTURE = CoreImage('Fin.png').texture
+    return _FALLBACK_TEXTURE
+
+
+def resolve_logo(ticker: str):
+    """Look up ticker's company name and pick its logo (runs on a worker thread)
+
+    Returns (company_name, logo), logo being (source, png, size, pixels) or None
+    when no candidate decoded. Errors from the company info lookup propagate.
+    """
+    info = get_info(ticker)
+    company_name = info.get('shortName', info.get('longName', ticker))
+    sources = logo_sources(ticker, info.get('quoteType'))
+
+    # Take the first candidate that decodes; only the texture upload needs
+    # the GL context, so that is all that waits for the UI thread
+    for logo_url, content in logo_candidates(ticker, sources):
+        decoded = decode_logo(content) if is_raster_image(content) else None
+        if decoded is not None:
+            # Cache downloads here, off the UI thread; the disk copy is already cached
+            if logo_url.startswith('http'):
+                save_logo(ticker, decoded[0])
+            return company_name, (logo_url, *decoded)
+        log.debug("Skipping non-image response from %s", logo_url)
+        if not logo_url.startswith('http'):
+            # A truncated or corrupt cached copy would otherwise be read on every visit
+            try:
+                Path(logo_url).unlink()
+            except OSError:
+                pass
+    return company_name, None
+
+
+def apply_logo(image_widget, ticker: str, logo) -> bool:
+    """Show a logo from resolve_logo on image_widget, else Fin.png (UI thread only)
+
+    Returns False, with image_widget hidden, if not even Fin.png could be shown.
+    """
+    if logo is not None:
+        logo_url, content, size, pixels = logo
+        try:
+            image_widget.texture = rgba_texture(size, pixels)
+            image_widget.opacity = 1
+            log.debug("Logo loaded from %s", logo_url)
+            return True
+        except Exception as e:
+            log.warning("Could not show logo from %s: %s", logo_url, e)
+
+    # Fallback: Use Fin.png if no logo could be loaded
+    try:
+        image_widget.texture = fallback_logo_texture()
+        image_widget.opacity = 1
+        log.debug("Using Fin.png as fallback logo")
+        return True
+    except Exception as e:
+        log.warning("Could not load fallback logo Fin.png: %s", e)
+        image_widget.opacity = 0
+        return False
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the n_out points Largest-Triangle-Three-Buckets keeps from (x, y)
+
+    Unlike taking every k-th point, each bucket keeps the point that changes
+    the line's shape the most, so spikes and dips survive the downsampling.
+    """
+    n = len(y)
+    n_out = int(n_out)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # First and last points are always kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Third corner of the triangle: the next bucket's centroid (the last point for the final bucket)
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        cx = x[hi:next_hi].mean()
+        cy = y[hi:next_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
 
 class CircularImage(Image):
     """Image widget that displays images in circular form using stencil clipping"""
@@ -36,11 +465,16 @@ class CircularImage(Image):
             StencilUse()
         with self.canvas.after:
             StencilPop()
-        self.bind(pos=self.update_ellipse, size=self.update_ellipse)
+        # pos and size usually change together during layout, update once per frame
+        self._update_ellipse_trigger = Clock.create_trigger(self.update_ellipse, -1)
+        self.bind(pos=self._update_ellipse_trigger, size=self._update_ellipse_trigger)
 
     def update_ellipse(self, *args):
-        self.ellipse.pos = self.pos
-        self.ellipse.size = self.size
+        pos, size = tuple(self.pos), tuple(self.size)
+        if self.ellipse.pos == pos and self.ellipse.size == size:
+            return
+        self.ellipse.pos = pos
+        self.ellipse.size = size
 
 class SimpleCard(BoxLayout):
     """Simple card with background"""
@@ -48,13 +482,17 @@ class SimpleCard(BoxLayout):
     def __init__(self, bg_color=(1, 1, 1, 0.15), **kwargs):
         super().__init__(**kwargs)
         self.bg_color = bg_color
-        self.bind(pos=self._update_bg, size=self._update_bg)
+        # Background instructions are created once and only moved afterwards
+        with self.canvas.before:
+            self._bg_color = Color(*self.bg_color)
+            self._bg_rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[15])
+        # pos and size usually change together during layout, redraw once per frame
+        self._update_bg_trigger = Clock.create_trigger(self._update_bg, -1)
+        self.bind(pos=self._update_bg_trigger, size=self._update_bg_trigger)
     
     def _update_bg(self, *args):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(*self.bg_color)
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[15])
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
 
 
 class SimpleTextInput(TextInput):
@@ -84,15 +522,21 @@ class SimpleButton(Button):
         self.disabled_color = (0.5, 0.5, 0.5, 0.6)
         self.current_color = self.normal_color
         
-        self.bind(pos=self._update_bg, size=self._update_bg)
+        # Background instructions are created once; state changes only recolor them
+        with self.canvas.before:
+            self._bg_color = Color(*self.current_color)
+            self._bg_rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[12])
+        
+        # pos and size usually change together during layout, redraw once per frame
+        self._update_bg_trigger = Clock.create_trigger(self._update_bg, -1)
+        self.bind(pos=self._update_bg_trigger, size=self._update_bg_trigger)
         self.bind(state=self._on_state_change)
         self.bind(disabled=self._on_disabled_change)
     
     def _update_bg(self, *args):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(*self.current_color)
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[12])
+        self._bg_color.rgba = self.current_color
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
     
     def _on_state_change(self, instance, state):
         if not self.disabled:
@@ -192,7 +636,7 @@ class DetailScreen(Screen):
         self.detail_label.bind(size=self._update_label_text_size)
 
         # Add widgets to cards
-        self.chart = HistoryChartGarden(size_hint=(1, 1))
+        self.chart = HistoryChart(size_hint=(1, 1))
         self.chart_card.add_widget(self.chart)
         self.metrics_card.add_widget(self.detail_label)
 
@@ -215,7 +659,7 @@ class DetailScreen(Screen):
             self.chart.load_data(ticker)
             self.detail_label.text = detailed_text
         except Exception as e:
-            print(f"Error showing details: {e}")
+            log.warning("Error showing details: %s", e)
             self.detail_label.text = f"Error loading data: {str(e)}"
 
 
@@ -226,6 +670,16 @@ class MainScreen(Screen):
         self.layout = StockAnalyzerLayout()
         self.add_widget(self.layout)
 
+
+# Risk level in the analysis text, and the color the summary is shown in
+_LEVEL_RE = re.compile(r"Risk Level:\s*(HIGH|MEDIUM|LOW)")
+_LEVEL_COLORS = {
+    "HIGH": (1, 0.1, 0.1, 1),
+    "MEDIUM": (1, 0.8, 0.2, 1),
+    "LOW": (0.1, 1, 0.1, 1),
+}
+
+
 class StockAnalyzerLayout(BoxLayout):
     """Modified layout with screen management"""
     def __init__(self, **kwargs):
@@ -233,8 +687,15 @@ class StockAnalyzerLayout(BoxLayout):
         self.orientation = 'vertical'
         self.padding = [50, 20, 50, 20]
         self.spacing = 15
+        self._logo_ticker = None
+        self.company_name_label = None  # created the first time a logo is shown
+        # Validated ticker the current results belong to; the input box may
+        # have been edited since, so logo and details go by this instead
+        self.analyzed_ticker = None
         
         # Create UI elements
+        # A window drag fires on_resize many times per frame, rescale at most once per frame
+        self._scale_logo_trigger = Clock.create_trigger(self.scale_logo, -1)
         Window.bind(on_resize=self.on_window_resize)
         self.create_ui()
         
@@ -348,7 +809,7 @@ class StockAnalyzerLayout(BoxLayout):
             padding=[10, 10],
             text_size=(None, None)  # Allow wrapping
         )
-        self.result_label.bind(texture_size=lambda *x: setattr(self.result_label, 'height', self.result_label.texture_size[1] + 20))  # + padding
+        self.result_label.bind(texture_size=self._update_label_height)
 
         self.results_container.add_widget(self.company_logo)
         self.results_container.add_widget(self.result_label)
@@ -380,9 +841,9 @@ class StockAnalyzerLayout(BoxLayout):
     
     def on_window_resize(self, instance, width, height):
         """Handle window resize events to scale the logo appropriately"""
-        self.scale_logo()
+        self._scale_logo_trigger()
         
-    def scale_logo(self):
+    def scale_logo(self, *args):
         """Scale the logo based on window size"""
         window_width = Window.width
         
@@ -410,17 +871,11 @@ class StockAnalyzerLayout(BoxLayout):
         self.more_info_button.disabled = not show_more_info
         
         # Simplified result display
-        if "Risk Level: HIGH" in text:
-            simple_text = "Risk Level: HIGH"
-            self.result_label.color = (1, 0.1, 0.1, 1)
-            self.load_company_logo()
-        elif "Risk Level: MEDIUM" in text:
-            simple_text = "Risk Level: MEDIUM"
-            self.result_label.color = (1, 0.8, 0.2, 1)
-            self.load_company_logo()
-        elif "Risk Level: LOW" in text:
-            simple_text = "Risk Level: LOW"
-            self.result_label.color = (0.1, 1, 0.1, 1)
+        match = _LEVEL_RE.search(text)
+        if match:
+            level = match.group(1)
+            simple_text = f"Risk Level: {level}"
+            self.result_label.color = _LEVEL_COLORS[level]
             self.load_company_logo()
         else:
             simple_text = text
@@ -431,6 +886,7 @@ class StockAnalyzerLayout(BoxLayout):
 
     def set_loading_state(self, is_loading: bool = True):
         if is_loading:
+            self.analyzed_ticker = None
             self.analyze_button.text = "ANALYZING..."
             self.analyze_button.disabled = True
             self.set_result_text("Analyzing stock data...\n\nFetching market data and calculating risk metrics.")
@@ -447,155 +903,71 @@ class StockAnalyzerLayout(BoxLayout):
     
     def load_company_logo(self):
         """Load company logo image from Yahoo Finance"""
-        ticker = self.get_ticker_input()
+        ticker = self.analyzed_ticker
         if not ticker:
             return
         
+        # Network work happens on a worker thread; only the newest request
+        # is allowed to touch the widgets when it comes back
+        self._logo_ticker = ticker
+        threading.Thread(target=self._fetch_company_logo, args=(ticker,), daemon=True).start()
+    
+    def _fetch_company_logo(self, ticker: str):
+        """Look up the company name and logo (runs on a worker thread)"""
         try:
-            from kivy.clock import Clock
-            import requests
-            from io import BytesIO
-            from kivy.core.image import Image as CoreImage
-            
-            def download_and_display_logo(dt):
-                try:
-                    # Get company info from yfinance
-                    stock = yf.Ticker(ticker)
-                    info = stock.info
-                    company_name = info.get('shortName', info.get('longName', ticker))
-
-                    # Try multiple logo sources with additional fallback for crypto, ETFs, and indices
-                    logo_sources = []
-                    # Special handling for crypto tickers with suffix -USD or similar
-                    if ticker.upper().endswith("-USD"):
-                        base_ticker = ticker.upper().replace("-USD", "").lower()
-                        # Multiple crypto logo sources
-                        logo_sources.extend([
-                        f"https://cryptologos.cc/logos/{base_ticker}-{base_ticker}-logo.png",
-                        f"https://raw.githubusercontent.com/spothq/cryptocurrency-icons/master/128/color/{base_ticker}.png",
-                        f"https://cryptoicons.org/api/icon/{base_ticker}/200",
-                        f"https://s3-symbol-logo.tradingview.com/crypto/XTVC-{base_ticker}.svg",
-                        ])
-                    else:
-                        logo_sources.extend([
-                            f"https://storage.googleapis.com/iex/api/logos/{ticker.upper()}.png",
-                            f"https://img.logo.dev/{ticker.lower()}.com?token=pk_KJ6f8BqBRoW8cLxNfE8L8A",
-                            f"https://s3-symbol-logo.tradingview.com/crypto/XTVC-{ticker.lower()}.svg",
-                            f"https://s3-symbol-logo.tradingview.com/etf/{ticker.lower()}.svg",
-                            f"https://s3-symbol-logo.tradingview.com/index/{ticker.lower()}.svg"
-                        ])
-
-                    logo_loaded = False
-                    for logo_url in logo_sources:
-                        try:
-                            if logo_url.endswith('.svg'):
-                                continue
-                            response = requests.get(logo_url, timeout=3)
-                            if response.status_code == 200:
-                                data = BytesIO(response.content)
-                                core_image = CoreImage(data, ext='png')
-                                if core_image.texture:
-                                    self.company_logo.texture = core_image.texture
-                                if core_image.texture:
-                                    self.company_logo.texture = core_image.texture
-                                    self.company_logo.opacity = 1
-                                    logo_loaded = True
-                                    print(f"Logo loaded successfully from: {logo_url}")
-
-                                    # Add company name label below logo if not exists
-                                    if not hasattr(self, 'company_name_label'):
-                                        self.company_name_label = Label(
-                                            text="",
-                                            markup=True,
-                                            size_hint=(1, None),
-                                            height=40,
-                                            halign='center',
-                                            valign='middle',
-                                            color=(1, 1, 1, 0.9),
-                                            font_size='16sp'
-                                        )
-                                        self.company_name_label.bind(size=lambda *x: setattr(self.company_name_label, 'text_size', (self.company_name_label.width, None)))
-                                        # Add after logo
-                                        logo_index = self.results_container.children.index(self.company_logo)
-                                        self.results_container.add_widget(self.company_name_label, index=logo_index)
-
-                                    self.company_name_label.text = f"[b]{company_name}[/b]\n{ticker}"
-                                    self.company_name_label.opacity = 1
-                                    return
-                                else:
-                                    print("Failed to create texture from image data")
-                            else:
-                                print(f"Failed to load logo from {logo_url}, status: {response.status_code}")
-                        except Exception as e:
-                            print(f"Exception loading logo from {logo_url}: {e}")
-                            continue
-
-                    # Fallback: Use Fin.png if no logo could be loaded
-                    try:
-                        # Use Fin.png as fallback
-                        self.company_logo.source = 'Fin.png'
-                        self.company_logo.opacity = 1
-                        logo_loaded = True
-                        print("Using Fin.png as fallback logo")
-                        
-                        # Add company name label below logo if not exists
-                        if not hasattr(self, 'company_name_label'):
-                            self.company_name_label = Label(
-                                text="",
-                                markup=True,
-                                size_hint=(1, None),
-                                height=40,
-                                halign='center',
-                                valign='middle',
-                                color=(1, 1, 1, 0.9),
-                                font_size='16sp'
-                            )
-                            self.company_name_label.bind(size=lambda *x: setattr(self.company_name_label, 'text_size', (self.company_name_label.width, None)))
-                            # Add after logo
-                            logo_index = self.results_container.children.index(self.company_logo)
-                            self.results_container.add_widget(self.company_name_label, index=logo_index)
-                            
-                        self.company_name_label.text = f"[b]{company_name}[/b]\n{ticker}"
-                        self.company_name_label.opacity = 1
-                    except Exception as e:
-                        print(f"Failed to load fallback logo Fin.png: {e}")
-                        # If even the fallback fails, show text-based logo
-                        self.company_logo.opacity = 0
-                        
-                        if not hasattr(self, 'company_name_label'):
-                            self.company_name_label = Label(
-                                text="",
-                                markup=True,
-                                size_hint=(1, None),
-                                height=60,
-                                halign='center',
-                                valign='middle',
-                                color=(1, 1, 1, 0.9),
-                                font_size='18sp'
-                            )
-                            self.company_name_label.bind(size=lambda *x: setattr(self.company_name_label, 'text_size', (self.company_name_label.width, None)))
-                            logo_index = self.results_container.children.index(self.company_logo)
-                            self.results_container.add_widget(self.company_name_label, index=logo_index)
-
-                        # Show text-based logo
-                        logo_text = f"[b][size=24sp]{company_name}[/size][/b]\n[size=14sp]{ticker}[/size]"
-                        self.company_name_label.text = logo_text
-                        self.company_name_label.opacity = 1
-                    
-                except Exception as e:
-                    print(f"Could not load company info: {e}")
-                    self.hide_company_logo()
-            
-            Clock.schedule_once(download_and_display_logo, 0.1)
-            
+            company_name, logo = resolve_logo(ticker)
         except Exception as e:
-            print(f"Error loading company info: {e}")
+            log.warning("Could not load company info: %s", e)
+            company_name, logo = None, None
+        Clock.schedule_once(partial(self._show_company_logo, ticker, company_name, logo), 0)
+    
+    def _show_company_logo(self, ticker: str, company_name, logo, dt):
+        """Show the fetched logo and company name (runs on the UI thread)"""
+        if ticker != self._logo_ticker:
+            return  # a newer analysis replaced this one
+        if company_name is None:
             self.hide_company_logo()
+            return
+        
+        shown = apply_logo(self.company_logo, ticker, logo)
+        
+        # Add company name label below logo if not exists
+        if self.company_name_label is None:
+            self.company_name_label = Label(
+                text="",
+                markup=True,
+                size_hint=(1, None),
+                height=40,
+                halign='center',
+                valign='middle',
+                color=(1, 1, 1, 0.9),
+                font_size='16sp'
+            )
+            self.company_name_label.bind(size=self._update_label_text_size)
+            # Add after logo
+            logo_index = self.results_container.children.index(self.company_logo)
+            self.results_container.add_widget(self.company_name_label, index=logo_index)
+        
+        if shown:
+            self.company_name_label.height = 40
+            self.company_name_label.text = f"[b]{company_name}[/b]\n{ticker}"
+        else:
+            # No image at all, so show a text-based logo
+            self.company_name_label.height = 60
+            self.company_name_label.text = f"[b][size=24sp]{company_name}[/size][/b]\n[size=14sp]{ticker}[/size]"
+        self.company_name_label.opacity = 1
     
+    def _update_label_text_size(self, instance, value):
+        instance.text_size = (value[0], None)
+
+    def _update_label_height(self, instance, value):
+        instance.height = value[1] + 20  # + padding
+
     def hide_company_logo(self):
         """Hide the company logo and name"""
+        self._logo_ticker = None  # results still in flight are dropped
         self.company_logo.opacity = 0
-        if hasattr(self, 'company_name_label'):
+        if self.company_name_label is not None:
             self.company_name_label.opacity = 0
 
     def show_details(self, instance):
@@ -606,7 +978,9 @@ class StockAnalyzerLayout(BoxLayout):
         
         # Set detailed text, load chart, and switch screens
         detail_screen = screen_manager.get_screen('detail')
-        ticker = self.get_ticker_input()
+        ticker = self.analyzed_ticker
+        if not ticker:
+            return
         detail_screen.show_ticker_details(ticker, self.detailed_results)
         screen_manager.current = 'detail'
 
@@ -646,7 +1020,7 @@ class TopStocksScreen(Screen):
         )
 
         # Scrollable content for stock list
-        scroll_content = ScrollView(
+        self.scroll_content = scroll_content = ScrollView(
             size_hint=(1, 1),
             do_scroll_x=False,
             do_scroll_y=True,
@@ -693,6 +1067,11 @@ class TopStocksScreen(Screen):
         self.content_widget.opacity = 0
         self.loading_label.opacity = 1
 
+        # Logo requests from the cards built in one frame are gathered here and
+        # sent off together, see _load_stock_logo
+        self._logo_queue = []
+        self._flush_logo_trigger = Clock.create_trigger(self._flush_logo_queue, 0.05)
+
         # Load data when screen is entered
         self.bind(on_enter=self.load_top_stocks)
 
@@ -711,7 +1090,7 @@ class TopStocksScreen(Screen):
 
             # Fetch top stocks
             top_stocks = get_top_low_risk_stocks(5)
-
+            
             if not top_stocks:
                 error_label = Label(
                     text="No low-risk stocks found.\nPlease check your internet connection.",
@@ -723,13 +1102,16 @@ class TopStocksScreen(Screen):
                 )
                 self.content_layout.add_widget(error_label)
             else:
-                # Display each stock
-                for i, metrics in enumerate(top_stocks, 1):
-                    stock_card = self._create_stock_card(metrics, i)
+                # Display each stock. Detach the list while filling it so the
+                # ScrollView lays out once instead of after every card
+                stock_cards = [self._create_stock_card(metrics, i) for i, metrics in enumerate(top_stocks, 1)]
+                self.scroll_content.remove_widget(self.content_layout)
+                for stock_card in stock_cards:
                     self.content_layout.add_widget(stock_card)
+                self.scroll_content.add_widget(self.content_layout)
 
         except Exception as e:
-            print(f"Error loading top stocks: {e}")
+            log.warning("Error loading top stocks: %s", e)
             error_label = Label(
                 text=f"Error loading stocks:\n{str(e)}",
                 size_hint=(1, 1),
@@ -831,204 +1213,152 @@ class TopStocksScreen(Screen):
         return card
 
     def _load_stock_logo(self, ticker, image_widget, name_label):
-        """Load stock logo and company name"""
-        from kivy.clock import Clock
-        import requests
-        from io import BytesIO
-        from kivy.core.image import Image as CoreImage
-
-        def download_logo(dt):
-            try:
-                # Get company info
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                company_name = info.get('shortName', info.get('longName', ticker))
-
-                # Update name label
-                name_label.text = f"[b]{company_name}[/b] ({ticker})"
-
-                # Try multiple logo sources with additional fallback for crypto, ETFs, and indices
-                logo_sources = []
-                # Special handling for crypto tickers with suffix -USD or similar
-                if ticker.upper().endswith("-USD"):
-                    base_ticker = ticker.upper().replace("-USD", "").lower()
-                    # Multiple crypto logo sources
-                    logo_sources.append(f"https://cryptologos.cc/logos/{base_ticker}-{base_ticker}-logo.png")
-                    logo_sources.append(f"https://raw.githubusercontent.com/spothq/cryptocurrency-icons/master/128/color/{base_ticker}.png")
-                    logo_sources.append(f"https://cryptoicons.org/api/icon/{base_ticker}/200")
-                    logo_sources.append(f"https://s3-symbol-logo.tradingview.com/crypto/XTVC-{base_ticker}.svg")
-                else:
-                    logo_sources = [
-                        f"https://storage.googleapis.com/iex/api/logos/{ticker.upper()}.png",
-                        f"https://api.logo.dev/{ticker}.com?size=200",
-                        f"https://companiesmarketcap.com/img/company-logos/64/{ticker.upper()}.png",
-                        f"https://companieslogo.com/img/orig/{ticker.upper()}-logo.png",
-                        f"https://s3-symbol-logo.tradingview.com/crypto/XTVC-{ticker.lower()}.svg",
-                        f"https://s3-symbol-logo.tradingview.com/etf/{ticker.lower()}.svg", 
-                        f"https://s3-symbol-logo.tradingview.com/index/{ticker.lower()}.svg"
-                        f"Fin-alpha/Fin.png"
-                    ]
-
-                logo_loaded = False
-                for logo_url in logo_sources:
-                    try:
-                        print(f"Trying logo URL: {logo_url}")
-                        response = requests.get(logo_url, timeout=3)
-                        print(f"Response status: {response.status_code}")
-                        if response.status_code == 200:
-                            data = BytesIO(response.content)
-                            # Handle SVG logos by skipping (Kivy does not support SVG natively)
-                            if logo_url.endswith('.svg'):
-                                print("Skipping SVG logo")
-                                continue
-                            core_image = CoreImage(data, ext='png')
-                            if core_image.texture:
-                                image_widget.texture = core_image.texture
-                                image_widget.opacity = 1
-                                logo_loaded = True
-                                print(f"Logo loaded successfully from: {logo_url}")
-                                break
-                            else:
-                                print("Failed to create texture from image data")
-                        else:
-                            print(f"Failed to load logo from {logo_url}, status: {response.status_code}")
-                    except Exception as e:
-                        print(f"Exception loading logo from {logo_url}: {e}")
-                        continue
-
-                if not logo_loaded:
-                    # Fallback: Use Fin.png if no logo could be loaded
-                    try:
-                        # Use Fin.png as fallback
-                        image_widget.source = 'Fin.png'
-                        image_widget.opacity = 1
-                        logo_loaded = True
-                        print("Using Fin.png as fallback logo")
-                    except Exception as e:
-                        print(f"Failed to load fallback logo Fin.png: {e}")
-                        # If even the fallback fails, hide image
-                        image_widget.opacity = 0
-
-            except Exception as e:
-                print(f"Error loading logo for {ticker}: {e}")
-                name_label.text = f"[b]{ticker}[/b]"
-                image_widget.opacity = 0
+        """Queue a card's logo and company name; the whole batch is fetched together"""
+        self._logo_queue.append((ticker, image_widget, name_label))
+        self._flush_logo_trigger()
+
+    def _flush_logo_queue(self, dt):
+        batch, self._logo_queue = self._logo_queue, []
+        if batch:
+            threading.Thread(target=self._fetch_stock_logos, args=(batch,), daemon=True).start()
+
+    def _fetch_stock_logos(self, batch):
+        """Fetch logos for a batch of cards at once (runs on a worker thread)"""
+        # Look up all company names together so each card's loader hits the cache
+        prefetch_info(ticker for ticker, _, _ in batch)
+        with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+            for args in batch:
+                executor.submit(self._fetch_stock_logo, *args)
+
+    def _fetch_stock_logo(self, ticker, image_widget, name_label):
+        """Look up the company name and logo (runs on a worker thread)"""
+        try:
+            company_name, logo = resolve_logo(ticker)
+        except Exception as e:
+            log.warning("Error loading logo for %s: %s", ticker, e)
+            company_name, logo = None, None
+        Clock.schedule_once(partial(self._show_stock_logo, ticker, image_widget, name_label, company_name, logo), 0)
+
+    def _show_stock_logo(self, ticker, image_widget, name_label, company_name, logo, dt):
+        """Show a card's logo and company name (runs on the UI thread)"""
+        if company_name is None:
+            name_label.text = f"[b]{ticker}[/b]"
+            image_widget.opacity = 0
+            return
 
-        Clock.schedule_once(download_logo, 0.1)
+        # Update name label
+        name_label.text = f"[b]{company_name}[/b] ({ticker})"
+        apply_logo(image_widget, ticker, logo)
 
 
-class HistoryChartGarden(BoxLayout):
-    """Matplotlib chart with improved visuals and performance"""
+class HistoryChart(BoxLayout):
+    """Price history drawn straight onto the Kivy canvas as a single line"""
 
     def __init__(self, period: str = "1y", line_color=(0.2, 0.8, 1.0, 1), **kwargs):
         super().__init__(**kwargs)
         self.orientation = 'vertical'
         self.period = period
         self.line_color = line_color
-        self.canvas_widget = None
-        self.chart_container = BoxLayout(orientation='vertical', size_hint=(1, 1))
-        self.add_widget(self.chart_container)
+        self.prices = None
+        self.high_price = self.low_price = None
+        # LTTB picks for the current prices at a given point budget, reused across redraws
+        self._sample_key = None
+        self._sample_indices = None
+        self._ticker = None
+
+        # Ticker plus current/high/low above the line
+        self.title_label = Label(
+            text="",
+            markup=True,
+            size_hint=(1, None),
+            height=30,
+            halign='center',
+            valign='middle',
+            color=(1, 1, 1, 1),
+            font_size='15sp'
+        )
+
+        self.plot = Widget(size_hint=(1, 1))
+        with self.plot.canvas:
+            Color(*self.line_color)
+            self.price_line = Line(points=[], width=1.5)
+
+        # Rebuild the points once per frame when the plot area moves or resizes
+        self._redraw_trigger = Clock.create_trigger(self._redraw, -1)
+        self.plot.bind(pos=self._redraw_trigger, size=self._redraw_trigger)
+
+        self.add_widget(self.title_label)
+        self.add_widget(self.plot)
 
     def load_data(self, ticker: str):
+        """Fetch ticker's history on a worker thread and draw it once it arrives"""
+        self._ticker = ticker
+        self.title_label.text = f"[b]{ticker}[/b]  Loading..."
+        future = _CHART_EXECUTOR.submit(get_history, ticker, self.period)
+        future.add_done_callback(lambda f: Clock.schedule_once(partial(self._on_history, ticker, f), 0))
+
+    def _on_history(self, ticker: str, future, dt):
+        if ticker != self._ticker:
+            return  # another ticker was opened meanwhile
         try:
-            import yfinance as yf
-            import matplotlib.pyplot as plt
-            import numpy as np
-            from matplotlib.ticker import FuncFormatter
-            from datetime import datetime
-            
-            # Create figure with dark theme
-            plt.style.use('dark_background')
-            fig = plt.figure(figsize=(10, 6), dpi=100, constrained_layout=True)
-            ax = fig.add_subplot(111)
-            
-            # Set colors
-            fig.patch.set_facecolor((0.05, 0.1, 0.2, 1))
-            ax.set_facecolor((0.05, 0.1, 0.2, 1))
+            self.show_history(ticker, future.result())
+        except Exception as e:
+            log.warning("Error loading chart for %s: %s", ticker, e)
+            self.prices = None
+            self.title_label.text = f"[b]{ticker}[/b]  Price history unavailable"
+            self._redraw()
+
+    def show_history(self, ticker: str, hist):
+        if hist.empty:
+            raise ValueError("No data available for this ticker")
+
+        # Header figures come from the float64 closes; float32 is only precise
+        # enough for drawing and would misreport cents at prices near 1e5
+        closes = np.asarray(hist['Close'], dtype=np.float64).ravel()
+        current_price = closes[-1]
+        high_price = closes.max()
+        low_price = closes.min()
+
+        self.prices = closes.astype(np.float32)
+        self._sample_key = None
+        # _redraw runs on every resize, so keep the range rather than rescanning the prices
+        self.high_price = float(high_price)
+        self.low_price = float(low_price)
+
+        self.title_label.text = (
+            f"[b]{ticker}[/b]  ${current_price:,.2f}    "
+            f"[color=90ee90]High: ${high_price:,.2f}[/color]    "
+            f"[color=ffc0cb]Low: ${low_price:,.2f}[/color]"
+        )
+        self._redraw()
 
-            # Get stock data and ensure it's properly formatted
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=self.period)
-            
-            if hist.empty:
-                raise ValueError("No data available for this ticker")
-                
-            # Extract close prices and ensure 1D array
-            prices = hist['Close'].values.flatten()
-            dates = hist.index  # Use actual dates for x-axis
-
-            # Create the line plot
-            ax.plot(dates, prices, color=self.line_color[:3], linewidth=2, label='Price')
-
-            # Add fill
-            ax.fill_between(dates, prices, np.min(prices), alpha=0.1, color=self.line_color[:3])
-
-            # Format y-axis with dollar signs
-            ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.2f}'))
-
-            # Format x-axis to show months
-            ax.xaxis.set_major_locator(mdates.MonthLocator())
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%b'))
-
-            # Add grid
-            ax.grid(True, alpha=0.2, linestyle='--', color='white')
-
-            # Add price markers
-            current_price = prices[-1]
-            high_price = np.max(prices)
-            low_price = np.min(prices)
-
-            # Annotate current price
-            ax.annotate(f'${current_price:,.2f}',
-                       xy=(dates[-1], current_price),
-                       xytext=(10, 0),
-                       textcoords='offset points',
-                       color='white',
-                       fontsize=10,
-                       bbox=dict(
-                           facecolor=(0.1, 0.2, 0.5, 0.8),
-                           edgecolor='none',
-                           pad=3
-                       ))
-
-            # Add high/low annotations
-            high_idx = np.argmax(prices)
-            low_idx = np.argmin(prices)
-
-            ax.annotate(f'High: ${high_price:,.2f}',
-                       xy=(dates[high_idx], high_price),
-                       xytext=(0, 15),
-                       textcoords='offset points',
-                       ha='center',
-                       color='lightgreen',
-                       fontsize=9)
-
-            ax.annotate(f'Low: ${low_price:,.2f}',
-                       xy=(dates[low_idx], low_price),
-                       xytext=(0, -15),
-                       textcoords='offset points',
-                       ha='center',
-                       color='pink',
-                       fontsize=9)
-            
-            # Clean up the plot
-            ax.set_title(f'{ticker} - 1 Year Price History', color='white', pad=10)
-            
-            # Remove spines
-            for spine in ax.spines.values():
-                spine.set_visible(False)
-                
-            # Update the canvas
-            if self.canvas_widget:
-                self.chart_container.remove_widget(self.canvas_widget)
-            
-            from kivy_garden.matplotlib.backend_kivyagg import FigureCanvasKivyAgg
-            self.canvas_widget = FigureCanvasKivyAgg(fig)
-            self.chart_container.add_widget(self.canvas_widget)
+    def _redraw(self, *args):
+        """Map the prices onto the plot area and update the line in place"""
+        prices = self.prices
+        if prices is None or len(prices) < 2:
+            self.price_line.points = []
+            return
+
+        pad = 10
+        x, y = self.plot.pos
+        width = max(self.plot.width - 2 * pad, 1)
+        height = max(self.plot.height - 2 * pad, 1)
+        low = self.low_price
+        span = (self.high_price - low) or 1.0
+
+        # More than one point per horizontal pixel can't be seen, so don't draw
+        # them; LTTB keeps the points that carry spikes and dips. Moving the
+        # chart without resizing it reuses the previous pick
+        key = int(width)
+        if key != self._sample_key:
+            self._sample_key = key
+            self._sample_indices = lttb_indices(np.arange(len(prices)), prices, width)
+        indices = self._sample_indices
+        points = np.empty((len(indices), 2), dtype=np.float32)
+        points[:, 0] = x + pad + indices * (width / (len(prices) - 1))
+        points[:, 1] = y + pad + (prices[indices] - low) * (height / span)
+        self.price_line.points = points.ravel().tolist()
 
-        except Exception as e:
-            print(f"Error creating chart: {e}")
-            raise e
 
 def create_main_ui():
     """Create the main screen manager with all screens"""